@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""Single-pass Numba kernels for the calculation of Demand Overlap Coefficients.
+
+The kernels are compiled with explicit signatures for C-contiguous float64 and float32
+arrays and cached on disk. They use NumPy's error model, so a zero denominator yields
+nan like the NumPy calculation instead of raising ZeroDivisionError. This module is
+imported by run_DOC_calculation.py on first use of a kernel, so that importing
+run_DOC_calculation.py does not import Numba.
+
+"""
+
+from numba import njit
+
+# Number of time steps per tile in single-pass kernel (2 x 256 kB of float64 fit in L2)
+_TILE = 32768
+
+
+@njit(
+    [
+        "UniTuple(float64, 3)(float64[::1], float64[::1], int64, int64)",
+        "UniTuple(float64, 3)(float32[::1], float32[::1], int64, int64)",
+    ],
+    cache=True,
+    fastmath=True,
+    boundscheck=False,
+)
+def _tile_sums(heat_dem, cool_dem, start, stop):
+    """Return sums of minimum, heating and cooling demand for one tile.
+
+    Sums are accumulated in float64 for float32 arrays as well.
+    """
+    counter = 0.0
+    heat = 0.0
+    cool = 0.0
+    for i in range(start, stop):
+        counter += min(heat_dem[i], cool_dem[i])
+        heat += heat_dem[i]
+        cool += cool_dem[i]
+
+    return counter, heat, cool
+
+
+@njit("UniTuple(float64, 2)(float64, float64, float64)", cache=True)
+def _kahan_add(total, compensation, value):
+    """Add value to total using Kahan summation, returns new total and compensation."""
+    y = value - compensation
+    t = total + y
+
+    return t, (t - total) - y
+
+
+@njit(
+    ["float64(float64[::1], float64[::1])", "float64(float32[::1], float32[::1])"],
+    cache=True,
+    boundscheck=False,
+    error_model="numpy",
+)
+def _doc_kernel(heat_dem, cool_dem):
+    """Calculate DOC according to Eq. (2) in a single pass over both arrays.
+
+    The arrays are processed in tiles fitting into L2 cache. Partial sums of the
+    tiles are combined with Kahan summation to preserve precision for long time
+    series (this function must not use fastmath, which would drop the compensation).
+    """
+    n = heat_dem.shape[0]
+    counter = 0.0
+    counter_comp = 0.0
+    denominator = 0.0
+    denominator_comp = 0.0
+    for start in range(0, n, _TILE):
+        tile_counter, tile_heat, tile_cool = _tile_sums(
+            heat_dem, cool_dem, start, min(start + _TILE, n)
+        )
+        counter, counter_comp = _kahan_add(counter, counter_comp, tile_counter)
+        denominator, denominator_comp = _kahan_add(
+            denominator, denominator_comp, tile_heat + tile_cool
+        )
+
+    return 2.0 * counter / denominator
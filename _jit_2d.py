@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""Parallel Numba kernel for the calculation of Demand Overlap Coefficients.
+
+The kernel for 2-D arrays (buildings, time steps) is kept apart from _jit.py, so that
+it is only compiled or loaded from cache when run_DOC_calculation.py calculates a
+mean BES DOC for large arrays. It is compiled with explicit signatures for
+C-contiguous float64 and float32 arrays and NumPy's error model, like the kernels of
+_jit.py.
+
+"""
+
+from numba import njit, prange
+
+
+@njit(
+    [
+        "float64(float64[:, ::1], float64[:, ::1])",
+        "float64(float32[:, ::1], float32[:, ::1])",
+    ],
+    parallel=True,
+    cache=True,
+    fastmath=True,
+    boundscheck=False,
+    error_model="numpy",
+)
+def _doc_kernel_2d(heat_dem, cool_dem):
+    """Calculate DOC according to Eq. (2) for 2-D arrays with buildings in parallel."""
+    counter = 0.0
+    denominator = 0.0
+    for b in prange(heat_dem.shape[0]):
+        local_counter = 0.0
+        local_denominator = 0.0
+        for t in range(heat_dem.shape[1]):
+            local_counter += min(heat_dem[b, t], cool_dem[b, t])
+            local_denominator += heat_dem[b, t] + cool_dem[b, t]
+        counter += local_counter
+        denominator += local_denominator
+
+    return 2.0 * counter / denominator
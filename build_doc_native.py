@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""Ahead-of-time compilation of the DOC kernel.
+
+Running this script compiles the single-pass DOC kernel of _jit.py for float64 and
+float32 arrays with Numba into the native extension module ``doc_native`` next to this
+script. If the module is present, run_DOC_calculation.py uses it and skips JIT
+compilation. The parallel kernel for the mean BES DOC is not compiled ahead of
+time, since Numba does not support ``parallel=True`` for AOT compilation.
+
+"""
+
+import os
+
+from numba.pycc import CC
+
+from _jit import _doc_kernel
+
+cc = CC("doc_native")
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+
+@cc.export("doc1d", "f8(f8[::1], f8[::1])")
+def doc1d(heat_dem, cool_dem):
+    return _doc_kernel(heat_dem, cool_dem)
+
+
+@cc.export("doc1d_f4", "f8(f4[::1], f4[::1])")
+def doc1d_f4(heat_dem, cool_dem):
+    return _doc_kernel(heat_dem, cool_dem)
+
+
+if __name__ == "__main__":
+    cc.compile()
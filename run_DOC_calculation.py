@@ -19,10 +19,83 @@ three DOCs are calculated for synthetic time series for one year in hourly resol
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
 
+# Number of values (buildings x time steps) above which the parallel kernel pays off
+_PARALLEL_THRESHOLD = 100_000
 
-def calc_DOC(heat_dem, cool_dem):
+
+def _check_dtype(dtype):
+    """Raise ValueError if dtype is no supported working precision."""
+    if np.dtype(dtype) not in (np.float64, np.float32):
+        raise ValueError("dtype must be np.float64 or np.float32.")
+
+
+def _stack(demands, dtype=np.float64):
+    """Return demand time series as C-contiguous array (buildings, time steps).
+
+    An already C-contiguous 2-D array of given dtype is returned without copying.
+    """
+    if isinstance(demands, np.ndarray) and demands.ndim == 2:
+        return np.ascontiguousarray(demands, dtype=dtype)
+    stacked = np.stack(demands, axis=0)
+    if stacked.ndim != 2:
+        raise ValueError("Demands must be a list of 1-D time series or a 2-D array.")
+    return np.ascontiguousarray(stacked, dtype=dtype)
+
+
+def _doc_numpy(heat_dem, cool_dem):
+    """Calculate DOC according to Eq. (2) for two arrays using NumPy."""
+    counter = 2.0 * np.minimum(heat_dem, cool_dem).sum(dtype=np.float64)
+    denominator = heat_dem.sum(dtype=np.float64) + cool_dem.sum(dtype=np.float64)
+
+    return counter / denominator
+
+
+# DOC kernels, loaded on first use to keep importing this module fast
+_doc_1d_f8 = None
+_doc_1d_f4 = None
+_doc_2d = None
+
+
+def _load_kernels_1d():
+    """Load DOC kernels for 1-D float64 and float32 arrays.
+
+    Kernels compiled ahead of time with build_doc_native.py are preferred, since they
+    neither import Numba nor require JIT compilation. Otherwise the Numba kernel of
+    _jit.py is used. Without Numba, DOCs are calculated with NumPy only.
+    """
+    global _doc_1d_f8, _doc_1d_f4
+
+    try:
+        from doc_native import doc1d as _doc_1d_f8, doc1d_f4 as _doc_1d_f4
+    except ImportError:
+        try:
+            from _jit import _doc_kernel
+        except ImportError:
+            _doc_kernel = _doc_numpy
+        _doc_1d_f8 = _doc_1d_f4 = _doc_kernel
+
+
+def _load_kernel_2d():
+    """Load parallel DOC kernel of _jit_2d.py, NumPy is used without Numba."""
+    global _doc_2d
+
+    try:
+        from _jit_2d import _doc_kernel_2d as _doc_2d
+    except ImportError:
+        _doc_2d = _doc_numpy
+
+
+def _doc_1d(heat_dem, cool_dem):
+    """Calculate DOC according to Eq. (2) for two C-contiguous 1-D arrays."""
+    if _doc_1d_f8 is None:
+        _load_kernels_1d()
+    if heat_dem.dtype == np.float32:
+        return _doc_1d_f4(heat_dem, cool_dem)
+    return _doc_1d_f8(heat_dem, cool_dem)
+
+
+def calc_DOC(heat_dem, cool_dem, dtype=np.float64):
     """Function to calculate DOC for time series.
 
     This function calculates the DOC for heating and cooling time series. It returns the
@@ -39,6 +112,10 @@ def calc_DOC(heat_dem, cool_dem):
         Numpy array with heating demand time series in same resolution as cool_dem.
     cool_dem : array_like
         Numpy array with cooling demand time series in same resolution as cool_dem.
+    dtype : numpy.dtype, optional
+        Working precision, np.float64 (default) or np.float32. Sums are accumulated in
+        float64 in both cases. float32 halves the memory traffic for inputs that are
+        already float32.
 
     Returns
     -------
@@ -46,15 +123,68 @@ def calc_DOC(heat_dem, cool_dem):
         DOC for given time series.
     """
 
-    t_steps = range(len(heat_dem))  # Number of time steps
+    _check_dtype(dtype)
+    heat_dem = np.ascontiguousarray(heat_dem, dtype=dtype)
+    cool_dem = np.ascontiguousarray(cool_dem, dtype=dtype)
+    if heat_dem.shape != cool_dem.shape:
+        raise ValueError("heat_dem and cool_dem must have the same dimensions.")
+    if heat_dem.ndim != 1:
+        raise ValueError("heat_dem and cool_dem must be one-dimensional time series.")
+
+    return _doc_1d(heat_dem, cool_dem)
+
 
-    counter = sum((2 * np.min([heat_dem[k], cool_dem[k]])) for k in t_steps)
-    denominator = sum((heat_dem[k] + cool_dem[k]) for k in t_steps)
+def calc_DOC_batch(heat_dem_list, cool_dem_list, dtype=np.float64, buffer=None):
+    """Function to calculate DOCs for time series of several buildings at once.
+
+    This function calculates the DOC according to Eq. (2) for each pair of heating and
+    cooling time series, e.g. the BES DOC of each building in Eq. (10). It is equivalent
+    to calling calc_DOC for each building, but processes all buildings in one
+    vectorized calculation. Input parameters heat_dem_list and cool_dem_list need to
+    have the same dimensions.
+
+    Parameters
+    ----------
+    heat_dem_list : list or numpy.ndarray
+        List with array_like demand time series for heating, or 2-D array with shape
+        (buildings, time steps). C-contiguous arrays of dtype are used without copying.
+    cool_dem_list : list or numpy.ndarray
+        List with array_like demand time series for cooling, or 2-D array with shape
+        (buildings, time steps). C-contiguous arrays of dtype are used without copying.
+    dtype : numpy.dtype, optional
+        Working precision, np.float64 (default) or np.float32. Sums are accumulated in
+        float64 in both cases.
+    buffer : numpy.ndarray, optional
+        Array with shape (buildings, time steps) and given dtype to hold the elementwise
+        minimum of the demands. Passing the same buffer to repeated calls avoids
+        allocating a temporary array in each call.
+
+    Returns
+    -------
+    numpy.ndarray
+        DOC for each building, 1-D array with length of number of buildings.
+    """
+
+    _check_dtype(dtype)
+
+    # Stack time series to arrays with shape (buildings, time steps)
+    heat_dem = _stack(heat_dem_list, dtype)
+    cool_dem = _stack(cool_dem_list, dtype)
+    if heat_dem.shape != cool_dem.shape:
+        raise ValueError("heat_dem_list and cool_dem_list must have the same dimensions.")
+    if buffer is not None and (buffer.shape != heat_dem.shape or buffer.dtype != dtype):
+        raise ValueError("buffer must have shape (buildings, time steps) and given dtype.")
+
+    # Sum over time steps of each building
+    minimum = np.minimum(heat_dem, cool_dem, out=buffer)
+    counter = 2.0 * minimum.sum(axis=1, dtype=np.float64)
+    denominator = heat_dem.sum(axis=1, dtype=np.float64)
+    denominator += cool_dem.sum(axis=1, dtype=np.float64)
 
     return counter / denominator
 
 
-def calc_mean_BES_DOC(heat_dem_list, cool_dem_list):
+def calc_mean_BES_DOC(heat_dem_list, cool_dem_list, dtype=np.float64):
     """Function to calculate DOC for an arbitrary number of buildings.
 
     This function calculates the mean DOC for a number of buildingsas defined in Eq.
@@ -64,10 +194,15 @@ def calc_mean_BES_DOC(heat_dem_list, cool_dem_list):
 
     Parameters
     ----------
-    heat_dem_list : list
-        List with array_like demand time series for heating.
-    cool_dem_list : list
-        List with array_like demand time series for cooling.
+    heat_dem_list : list or numpy.ndarray
+        List with array_like demand time series for heating, or 2-D array with shape
+        (buildings, time steps). C-contiguous arrays of dtype are used without copying.
+    cool_dem_list : list or numpy.ndarray
+        List with array_like demand time series for cooling, or 2-D array with shape
+        (buildings, time steps). C-contiguous arrays of dtype are used without copying.
+    dtype : numpy.dtype, optional
+        Working precision, np.float64 (default) or np.float32. Sums are accumulated in
+        float64 in both cases.
 
     Returns
     -------
@@ -75,24 +210,23 @@ def calc_mean_BES_DOC(heat_dem_list, cool_dem_list):
         mean DOC for given time series as defined in Eq. (11).
     """
 
-    t_steps = range(len(heat_dem_list[0]))  # Number of time steps
-    bldgs = range(len(heat_dem_list))       # Number of buildings
-
-    counter = 2 * sum(
-        sum(np.min([heat_dem_list[b][t], cool_dem_list[b][t]], 0) for b in bldgs)
-        for t in t_steps
-    )
+    _check_dtype(dtype)
 
-    denominator = sum(
-        sum(heat_dem_list[b][t] for b in bldgs)
-        + sum(cool_dem_list[b][t] for b in bldgs)
-        for t in t_steps
-    )
+    # Stack time series to arrays with shape (buildings, time steps)
+    heat_dem = _stack(heat_dem_list, dtype)
+    cool_dem = _stack(cool_dem_list, dtype)
+    if heat_dem.shape != cool_dem.shape:
+        raise ValueError("heat_dem_list and cool_dem_list must have the same dimensions.")
 
-    return counter / denominator
+    # Eq. (11) sums over all buildings and time steps, i.e. Eq. (2) for flattened arrays
+    if heat_dem.size > _PARALLEL_THRESHOLD:
+        if _doc_2d is None:
+            _load_kernel_2d()
+        return _doc_2d(heat_dem, cool_dem)
+    return _doc_1d(heat_dem.ravel(), cool_dem.ravel())
 
 
-def calc_Network_DOC(heat_dem_list, cool_dem_list):
+def calc_Network_DOC(heat_dem_list, cool_dem_list, dtype=np.float64):
     """Function to calculate DOC for thermal network.
 
     This function calculates the network DOC for a number of connected buildings as
@@ -102,10 +236,15 @@ def calc_Network_DOC(heat_dem_list, cool_dem_list):
 
     Parameters
     ----------
-    heat_dem_list : list
-        List with array_like demand time series for heating.
-    cool_dem_list : list
-        List with array_like demand time series for cooling.
+    heat_dem_list : list or numpy.ndarray
+        List with array_like demand time series for heating, or 2-D array with shape
+        (buildings, time steps). C-contiguous arrays of dtype are used without copying.
+    cool_dem_list : list or numpy.ndarray
+        List with array_like demand time series for cooling, or 2-D array with shape
+        (buildings, time steps). C-contiguous arrays of dtype are used without copying.
+    dtype : numpy.dtype, optional
+        Working precision, np.float64 (default) or np.float32. Sums are accumulated in
+        float64 in both cases.
 
     Returns
     -------
@@ -113,17 +252,17 @@ def calc_Network_DOC(heat_dem_list, cool_dem_list):
         Network DOC for given time series as defined in Eq. (15).
     """
 
-    t_steps = range(len(heat_dem_list[0]))  # Number of time steps
-    bldgs = range(len(heat_dem_list))       # Number of buildings
+    _check_dtype(dtype)
 
-    counter = 2 * sum(np.min([sum(heat_dem_list[b][t] for b in bldgs),
-                              sum(cool_dem_list[b][t] for b in bldgs)], 0) 
-                  for t in t_steps)
+    # Stack time series to arrays with shape (buildings, time steps)
+    heat_dem = _stack(heat_dem_list, dtype)
+    cool_dem = _stack(cool_dem_list, dtype)
+    if heat_dem.shape != cool_dem.shape:
+        raise ValueError("heat_dem_list and cool_dem_list must have the same dimensions.")
 
-    denominator = sum(sum(heat_dem_list[b][t] for b in bldgs)
-                    + sum(cool_dem_list[b][t] for b in bldgs) for t in t_steps)
-
-    return counter / denominator
+    # Sum demands of all buildings for each time step
+    return _doc_1d(heat_dem.sum(axis=0, dtype=np.float64),
+                   cool_dem.sum(axis=0, dtype=np.float64))
 
 
 
@@ -132,22 +271,29 @@ if __name__ == "__main__":
     # CREATE EXEMPLARY DEMAND TIME SERIES
 
     # Time steps
-    time = np.linspace(0, 8759, 8760)
+    time = np.arange(8760, dtype=np.float64)
 
     # Building 1: heat/cold demand (sine curve)
-    heat_demand_bldg_1 = 1 * (np.sin(time / 8760 * 2 * np.pi + np.pi / 2) + 1)
-    cold_demand_bldg_1 = 1 * (np.sin(time / 8760 * 2 * np.pi - np.pi / 2) + 1)
+    # sin(x + pi/2) = cos(x) and sin(x - pi/2) = -cos(x), so one cosine serves both
+    cos_phase = np.cos(time * (2 * np.pi / 8760))
+    heat_demand_bldg_1 = 1 * (cos_phase + 1)
+    cold_demand_bldg_1 = 1 * (1 - cos_phase)
 
     # Building 2: heat/cold demand (constand demand)
     heat_demand_bldg_2 = 1 * np.ones(8760)
     cold_demand_bldg_2 = 2 * np.ones(8760)
 
 
+    # Collect time series of all buildings in arrays with shape (buildings, time steps)
+    heat_demand_bldg = np.stack([heat_demand_bldg_1, heat_demand_bldg_2])
+    cold_demand_bldg = np.stack([cold_demand_bldg_1, cold_demand_bldg_2])
+
+
     # DISTRICT DOC
 
     # For calculating the District DOC, sum time series of all buildings
-    sum_heat_demand = heat_demand_bldg_1 + heat_demand_bldg_2
-    sum_cool_demand = cold_demand_bldg_1 + cold_demand_bldg_2
+    sum_heat_demand = heat_demand_bldg.sum(axis=0)
+    sum_cool_demand = cold_demand_bldg.sum(axis=0)
 
     # Calculate DOC
     DOC_district = calc_DOC(sum_heat_demand, sum_cool_demand)       # Eq. (6)
@@ -160,52 +306,37 @@ if __name__ == "__main__":
     COP_HP = 4
     COP_CC = 5
 
-    # Building 1
-    heat_demand_BES_1 = heat_demand_bldg_1 * (1 - 1 / COP_HP)       # Eq. (7)
-    cold_demand_BES_1 = cold_demand_bldg_1 * (1 + 1 / COP_CC)       # Eq. (8)
-    DOC_BES_1 = calc_DOC(heat_demand_BES_1, cold_demand_BES_1)      # Eq. (10)
-    print("DOC BES of building 1 is " + str(round(DOC_BES_1, 3)) + ".")
+    # Demands of building energy systems of all buildings
+    heat_demand_BES = heat_demand_bldg * (1 - 1 / COP_HP)           # Eq. (7)
+    cold_demand_BES = cold_demand_bldg * (1 + 1 / COP_CC)           # Eq. (8)
 
-    # Building 2
-    heat_demand_BES_2 = heat_demand_bldg_2 * (1 - 1 / COP_HP)       # Eq. (7)
-    cold_demand_BES_2 = cold_demand_bldg_2 * (1 + 1 / COP_CC)       # Eq. (8)
-    DOC_BES_2 = calc_DOC(heat_demand_BES_2, cold_demand_BES_2)      # Eq. (10)
-    print("DOC BES of building 2 is " + str(round(DOC_BES_2, 3)) + ".")
+    # Calculate DOC of each building
+    DOC_BES = calc_DOC_batch(heat_demand_BES, cold_demand_BES)      # Eq. (10)
+    for b, DOC_BES_b in enumerate(DOC_BES, start=1):
+        print("DOC BES of building " + str(b) + " is " + str(round(DOC_BES_b, 3)) + ".")
 
     # Mean BES DOC
-    # Collect time series of all buildings in list
-    heat_dem_list = [heat_demand_BES_1, heat_demand_BES_2]
-    cool_dem_list = [cold_demand_BES_1, cold_demand_BES_2]
-
-    # Calculate Network DOC
-    mean_BES_DOC = calc_mean_BES_DOC(heat_dem_list, cool_dem_list)  # Eq. (11)
+    mean_BES_DOC = calc_mean_BES_DOC(heat_demand_BES, cold_demand_BES)  # Eq. (11)
     print("Mean BES DOC is " + str(round(mean_BES_DOC, 3)) + ".")
 
 
     # NETWORK DOC (indicates balancing potential between buildings)
 
-    # Calculate net heat/cold demand
-    # Building 1
-    bal_1 = np.min([heat_demand_BES_1, cold_demand_BES_1], 0)       # Eq. (9)
-    heat_net_demand_1 = heat_demand_BES_1 - bal_1                   # Eq. (13)
-    cold_net_demand_1 = cold_demand_BES_1 - bal_1                   # Eq. (14)
-
-    # Building 2
-    bal_2 = np.min([heat_demand_BES_2, cold_demand_BES_2], 0)       # Eq. (9)
-    heat_net_demand_2 = heat_demand_BES_2 - bal_2                   # Eq. (13)
-    cold_net_demand_2 = cold_demand_BES_2 - bal_2                   # Eq. (14)
-
-    # Collect time series of all buildings in list
-    heat_dem_list = [heat_net_demand_1, heat_net_demand_2]
-    cool_dem_list = [cold_net_demand_1, cold_net_demand_2]
+    # Calculate net heat/cold demand of all buildings
+    bal = np.minimum(heat_demand_BES, cold_demand_BES)              # Eq. (9)
+    heat_net_demand = heat_demand_BES - bal                         # Eq. (13)
+    cold_net_demand = cold_demand_BES - bal                         # Eq. (14)
 
     # Calculate Network DOC
-    Network_DOC = calc_Network_DOC(heat_dem_list, cool_dem_list)    # Eq. (15)
+    Network_DOC = calc_Network_DOC(heat_net_demand, cold_net_demand)  # Eq. (15)
     print("Network DOC is " + str(round(Network_DOC, 3)) + ".")
 
 
     # VISUALIZE OVERLAP OF DEMANDS
 
+    # Matplotlib is only needed for visualization
+    import matplotlib.pyplot as plt
+
     # Create new figure
     fig = plt.figure()
     ax = fig.add_subplot(1, 1, 1, ylabel="Thermal demand (MW)", xlabel="Time (hours)")
@@ -219,7 +350,7 @@ if __name__ == "__main__":
     ax.fill_between(time, 0, sum_cool_demand, color=("#c2d1ed"), label="Cold demand")
 
     # Calculate balanced demands (overlapping area)
-    balanced_demands = np.min(np.array([sum_heat_demand, sum_cool_demand]), 0)
+    balanced_demands = np.minimum(sum_heat_demand, sum_cool_demand)
 
     # Color overlapping area
     ax.fill_between(time, 0, balanced_demands, color=("#e1d1e2"), label="Overlap of demands")
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""Tests for the calculation of Demand Overlap Coefficients.
+
+All DOC functions are checked against the loop formula of Eq. (2) for every available
+backend: NumPy only, Numba JIT kernels (_jit.py, _jit_2d.py) and the kernels compiled
+ahead of time with build_doc_native.py. Backends that are not available are skipped.
+
+"""
+
+import sys
+
+import numpy as np
+import pytest
+
+import run_DOC_calculation as doc
+
+
+# Number of time steps for long time series, above the parallel threshold
+N_LONG = doc._PARALLEL_THRESHOLD + 20_000
+
+
+def doc_loop(heat_dem, cool_dem):
+    """Calculate DOC according to Eq. (2) with a Python loop over all values."""
+    counter = 0.0
+    denominator = 0.0
+    for heat, cool in zip(np.ravel(heat_dem).tolist(), np.ravel(cool_dem).tolist()):
+        counter += 2 * min(heat, cool)
+        denominator += heat + cool
+
+    return counter / denominator
+
+
+def random_demands(shape, seed):
+    """Return random heating and cooling demands, including time steps without demand."""
+    rng = np.random.default_rng(seed)
+    heat_dem = rng.random(shape) * (rng.random(shape) > 0.2)
+    cool_dem = 2 * rng.random(shape) * (rng.random(shape) > 0.2)
+
+    return heat_dem, cool_dem
+
+
+@pytest.fixture(params=["numpy", "jit", "aot"])
+def backend(request, monkeypatch):
+    """Set DOC kernels of run_DOC_calculation.py to the requested backend."""
+    if request.param == "numpy":
+        doc_1d_f8 = doc_1d_f4 = doc_2d = doc._doc_numpy
+    elif request.param == "jit":
+        pytest.importorskip("numba")
+        from _jit import _doc_kernel
+        from _jit_2d import _doc_kernel_2d
+
+        doc_1d_f8 = doc_1d_f4 = _doc_kernel
+        doc_2d = _doc_kernel_2d
+    else:
+        doc_native = pytest.importorskip("doc_native")
+        doc_1d_f8 = doc_native.doc1d
+        doc_1d_f4 = doc_native.doc1d_f4
+        doc_2d = doc._doc_numpy
+
+    monkeypatch.setattr(doc, "_doc_1d_f8", doc_1d_f8)
+    monkeypatch.setattr(doc, "_doc_1d_f4", doc_1d_f4)
+    monkeypatch.setattr(doc, "_doc_2d", doc_2d)
+
+    return request.param
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+@pytest.mark.parametrize("n", [1, 100, N_LONG])
+def test_calc_DOC(backend, dtype, n):
+    heat_dem, cool_dem = random_demands(n, seed=n)
+    expected = doc_loop(heat_dem.astype(dtype), cool_dem.astype(dtype))
+
+    result = doc.calc_DOC(heat_dem, cool_dem, dtype=dtype)
+
+    assert result == pytest.approx(expected, rel=1e-9)
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+@pytest.mark.parametrize("shape", [(3, 100), (15, 8760)])
+def test_calc_mean_BES_DOC(backend, dtype, shape):
+    heat_dem, cool_dem = random_demands(shape, seed=1)
+    expected = doc_loop(heat_dem.astype(dtype), cool_dem.astype(dtype))
+
+    assert doc.calc_mean_BES_DOC(heat_dem, cool_dem, dtype=dtype) == pytest.approx(
+        expected, rel=1e-9
+    )
+    assert doc.calc_mean_BES_DOC(list(heat_dem), list(cool_dem), dtype=dtype) == (
+        pytest.approx(expected, rel=1e-9)
+    )
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+@pytest.mark.parametrize("shape", [(3, 100), (15, 8760)])
+def test_calc_Network_DOC(backend, dtype, shape):
+    heat_dem, cool_dem = random_demands(shape, seed=2)
+    expected = doc_loop(
+        heat_dem.astype(dtype).sum(axis=0, dtype=np.float64),
+        cool_dem.astype(dtype).sum(axis=0, dtype=np.float64),
+    )
+
+    result = doc.calc_Network_DOC(list(heat_dem), list(cool_dem), dtype=dtype)
+
+    assert result == pytest.approx(expected, rel=1e-9)
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+@pytest.mark.parametrize("shape", [(3, 100), (15, 8760)])
+def test_calc_DOC_batch(backend, dtype, shape):
+    heat_dem, cool_dem = random_demands(shape, seed=3)
+    expected = [doc.calc_DOC(h, c, dtype=dtype) for h, c in zip(heat_dem, cool_dem)]
+
+    result = doc.calc_DOC_batch(heat_dem, cool_dem, dtype=dtype)
+    result_buffer = doc.calc_DOC_batch(
+        heat_dem, cool_dem, dtype=dtype, buffer=np.empty(shape, dtype=dtype)
+    )
+
+    assert result.shape == (shape[0],)
+    np.testing.assert_allclose(result, expected, rtol=1e-9)
+    np.testing.assert_array_equal(result_buffer, result)
+
+
+def test_different_dimensions(backend):
+    with pytest.raises(ValueError):
+        doc.calc_DOC(np.ones(5), np.ones(1))
+    with pytest.raises(ValueError):
+        doc.calc_DOC(np.ones((2, 3)), np.ones((2, 3)))
+    with pytest.raises(ValueError):
+        doc.calc_DOC_batch(np.ones((2, 5)), np.ones((2, 4)))
+    with pytest.raises(ValueError):
+        doc.calc_mean_BES_DOC(np.ones((2, 5)), np.ones((3, 5)))
+    with pytest.raises(ValueError):
+        doc.calc_Network_DOC(np.ones((2, 5)), np.ones((2, 1)))
+
+
+@pytest.mark.parametrize("n", [100, N_LONG])
+def test_one_dimensional_building_demands(backend, n):
+    with pytest.raises(ValueError):
+        doc.calc_mean_BES_DOC(np.ones(n), np.ones(n))
+    with pytest.raises(ValueError):
+        doc.calc_Network_DOC(np.ones(n), np.ones(n))
+    with pytest.raises(ValueError):
+        doc.calc_DOC_batch(np.ones(n), np.ones(n))
+
+
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_zero_demand(backend, dtype):
+    zeros = np.zeros((2, 5))
+
+    assert np.isnan(doc.calc_DOC(np.zeros(5), np.zeros(5), dtype=dtype))
+    assert np.isnan(doc.calc_DOC([], [], dtype=dtype))
+    assert np.isnan(doc.calc_DOC_batch(zeros, zeros, dtype=dtype)).all()
+    assert np.isnan(doc.calc_mean_BES_DOC(zeros, zeros, dtype=dtype))
+    assert np.isnan(doc.calc_mean_BES_DOC(np.zeros((15, 8760)), np.zeros((15, 8760))))
+    assert np.isnan(doc.calc_Network_DOC(zeros, zeros, dtype=dtype))
+
+
+def test_unsupported_dtype():
+    with pytest.raises(ValueError):
+        doc.calc_DOC([1, 2, 3], [3, 2, 1], dtype=np.int64)
+    with pytest.raises(ValueError):
+        doc.calc_DOC_batch([[1, 2, 3]], [[3, 2, 1]], dtype=np.int64)
+    with pytest.raises(ValueError):
+        doc.calc_mean_BES_DOC([[1, 2, 3]], [[3, 2, 1]], dtype=np.int64)
+    with pytest.raises(ValueError):
+        doc.calc_Network_DOC([[1, 2, 3]], [[3, 2, 1]], dtype=np.int64)
+
+
+def test_invalid_buffer():
+    heat_dem, cool_dem = random_demands((3, 100), seed=5)
+    buffer_float32 = np.empty((3, 100), dtype=np.float32)
+    buffer_shape = np.empty((3, 99))
+
+    with pytest.raises(ValueError):
+        doc.calc_DOC_batch(heat_dem, cool_dem, buffer=buffer_float32)
+    with pytest.raises(ValueError):
+        doc.calc_DOC_batch(heat_dem, cool_dem, buffer=buffer_shape)
+
+
+@pytest.mark.parametrize("available", ["all", "jit", "numpy"])
+def test_load_kernels(monkeypatch, available):
+    # Hide kernel modules from import, so that the next backend is loaded
+    hidden = {
+        "all": [],
+        "jit": ["doc_native"],
+        "numpy": ["doc_native", "_jit", "_jit_2d"],
+    }
+    for module in hidden[available]:
+        monkeypatch.setitem(sys.modules, module, None)
+    for name in ["_doc_1d_f8", "_doc_1d_f4", "_doc_2d"]:
+        monkeypatch.setattr(doc, name, None)
+
+    try:
+        import doc_native
+
+        kernels_1d = (doc_native.doc1d, doc_native.doc1d_f4)
+    except ImportError:
+        try:
+            from _jit import _doc_kernel
+
+            kernels_1d = (_doc_kernel, _doc_kernel)
+        except ImportError:
+            kernels_1d = (doc._doc_numpy, doc._doc_numpy)
+    try:
+        from _jit_2d import _doc_kernel_2d as kernel_2d
+    except ImportError:
+        kernel_2d = doc._doc_numpy
+
+    heat_dem, cool_dem = random_demands((15, 8760), seed=4)
+
+    assert doc.calc_DOC(heat_dem[0], cool_dem[0]) == pytest.approx(
+        doc_loop(heat_dem[0], cool_dem[0]), rel=1e-9
+    )
+    assert doc.calc_mean_BES_DOC(heat_dem, cool_dem) == pytest.approx(
+        doc_loop(heat_dem, cool_dem), rel=1e-9
+    )
+    assert (doc._doc_1d_f8, doc._doc_1d_f4) == kernels_1d
+    assert doc._doc_2d is kernel_2d